@@ -18,16 +18,22 @@
 # Dependencies (install before running):
 #   - Python 3
 #   - websockets:  pip install websockets
+#   - numpy:       pip install numpy
 #   - AIS Stream API key (free): https://aisstream.io → https://aisstream.io/apikeys
 #   - GFW API token (optional, free): https://globalfishingwatch.org/our-apis/tokens (adds 96h presence)
 # See README.md in this repo for full setup and usage.
 
 import argparse
 import asyncio
+import functools
+import http.client
 import json
 import math
+import operator
 import os
 import sys
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -39,6 +45,41 @@ except ImportError:
     print("Requires: pip install websockets", file=sys.stderr)
     sys.exit(1)
 
+# websockets >= 13 can hand text frames over as raw bytes (no UTF-8 decode); older versions decode to str
+try:
+    from websockets.asyncio.client import connect as _ws_connect
+    _RECV_KWARGS = {"decode": False}
+except ImportError:
+    _ws_connect = websockets.connect
+    _RECV_KWARGS = {}
+
+try:
+    import numpy as np
+except ImportError:
+    print("Requires: pip install numpy", file=sys.stderr)
+    sys.exit(1)
+
+# Optional: orjson parses AIS frames several times faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: Numba compiles the batch distance loop (_batch_dists_sq_nm); NumPy is used otherwise
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if orjson is not None:
+    _json_loads = orjson.loads  # accepts bytes or str; errors subclass json.JSONDecodeError
+    _json_dumpb = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumpb(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 # --- Example default reference position (override with --lat / --lon for your vessel) ---
 DEFAULT_REF_LAT = 19.0 + 56.770 / 60.0   # 19.94617 (19 56.770N)
 DEFAULT_REF_LON = -(20.0 + 26.969 / 60.0)  # -20.44948 (20 26.969W)
@@ -47,28 +88,116 @@ AIS_STREAM_URL = "wss://stream.aisstream.io/v0/stream"
 GFW_REPORT_URL = "https://gateway.api.globalfishingwatch.org/v3/4wings/report"
 GFW_PRESENCE_DATASET = "public-global-presence:latest"
 GFW_HOURS_LOOKBACK = 96
+# Positions are buffered and distance-filtered in batches of this many messages
+AIS_BATCH_SIZE = 256
+# Frames without either substring are neither position reports (all three types end in
+# "PositionReport") nor server errors, so they are dropped without a JSON parse
+_SNIFF_MARKERS = {bytes: (b"PositionReport", b'"error"'), str: ("PositionReport", '"error"')}
+# Up to this range (NM) distances use the equirectangular approximation instead of haversine
+EQUIRECT_MAX_NM = 100.0
+# ...but only for reference points at or below this |latitude|; nearer the poles its error grows past 0.1%
+EQUIRECT_MAX_LAT = 75.0
 
 # --- Default credentials (used when env vars not set) ---
 # Set via env AISSTREAM_API_KEY / GFW_API_TOKEN or --api-key / --gfw-token. Leave empty in repo.
 DEFAULT_AISSTREAM_API_KEY = ""
 DEFAULT_GFW_API_TOKEN = ""
 
-# Earth radius in meters (for haversine)
+# Earth radius in meters (for distance calculations)
 R_M = 6_371_000
 M_TO_NM = 0.000539957
 
 
-def haversine_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Distance between two (lat, lon) points in nautical miles."""
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlam = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dphi / 2) ** 2
-        + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
-    )
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R_M * c * M_TO_NM
+def _batch_dists_sq_nm(lats, lons, ref_lat, ref_lon, equirect, out):
+    """Write squared distances (NM^2) from (ref_lat, ref_lon) into out; loop form of make_distance_checker's NumPy code, for Numba."""
+    nm_per_rad = R_M * M_TO_NM
+    phi1 = math.radians(ref_lat)
+    cos_phi1 = math.cos(phi1)
+    for i in range(lats.shape[0]):
+        lat = lats[i]
+        dlon = (lons[i] - ref_lon + 180.0) % 360.0 - 180.0
+        if equirect:
+            dy = math.radians(lat - ref_lat)
+            dx = math.radians(dlon) * math.cos(math.radians((lat + ref_lat) * 0.5))
+            d2 = nm_per_rad * nm_per_rad * (dx * dx + dy * dy)
+            if d2 <= EQUIRECT_MAX_NM * EQUIRECT_MAX_NM:
+                out[i] = d2
+                continue
+        phi2 = math.radians(lat)
+        s1 = math.sin((phi2 - phi1) * 0.5)
+        s2 = math.sin(math.radians(dlon) * 0.5)
+        a = s1 * s1 + cos_phi1 * math.cos(phi2) * s2 * s2
+        d = nm_per_rad * 2.0 * math.asin(math.sqrt(min(a, 1.0)))
+        out[i] = d * d
+
+
+if njit is not None:
+    _batch_dists_sq_nm = njit(cache=True)(_batch_dists_sq_nm)
+
+
+def make_distance_checker(ref_lat: float, ref_lon: float, radius_nm: float):
+    """
+    Build the batch distance check for one reference point and radius. cos(ref_lat), the NM scale factors and
+    radius_nm**2 are captured once and the equirectangular/haversine/Numba choice is made here, not per batch.
+    Returns check(lats, lons) -> (inside, dist_sq): squared distances (NM^2) and the mask dist_sq <= radius_nm**2,
+    so callers take a sqrt only for the rows they keep.
+    """
+    r2 = radius_nm * radius_nm
+    equirect = radius_nm <= EQUIRECT_MAX_NM and abs(ref_lat) <= EQUIRECT_MAX_LAT
+    if njit is not None:
+        # Compile (or load from cache) now so the JIT does not eat into the collection window
+        _batch_dists_sq_nm(np.zeros(1), np.zeros(1), ref_lat, ref_lon, equirect, np.empty(1))
+
+        def check(lats: np.ndarray, lons: np.ndarray):
+            d2 = np.empty(lats.size)
+            _batch_dists_sq_nm(lats, lons, ref_lat, ref_lon, equirect, d2)
+            return d2 <= r2, d2
+
+        return check
+
+    phi1 = math.radians(ref_lat)
+    cos_phi1 = math.cos(phi1)
+    nm_per_rad = R_M * M_TO_NM
+    nm_per_deg_sq = (nm_per_rad * math.pi / 180.0) ** 2
+    far_sq = EQUIRECT_MAX_NM * EQUIRECT_MAX_NM
+
+    def haversine_sq(lats: np.ndarray, dlon: np.ndarray) -> np.ndarray:
+        phi2 = np.radians(lats)
+        s1 = np.sin((phi2 - phi1) * 0.5)
+        s2 = np.sin(np.radians(dlon) * 0.5)
+        a = s1 * s1 + cos_phi1 * np.cos(phi2) * s2 * s2
+        return (nm_per_rad * 2.0 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))) ** 2
+
+    if equirect:
+
+        def check(lats: np.ndarray, lons: np.ndarray):
+            # Equirectangular about the mid-latitude: within 0.1% of haversine at these ranges
+            dlon = (lons - ref_lon + 180.0) % 360.0 - 180.0
+            dy = lats - ref_lat
+            dx = dlon * np.cos(np.radians((lats + ref_lat) * 0.5))
+            d2 = nm_per_deg_sq * (dx * dx + dy * dy)
+            far = d2 > far_sq
+            if far.any():
+                d2[far] = haversine_sq(lats[far], dlon[far])
+            return d2 <= r2, d2
+
+    else:
+
+        def check(lats: np.ndarray, lons: np.ndarray):
+            d2 = haversine_sq(lats, (lons - ref_lon + 180.0) % 360.0 - 180.0)
+            return d2 <= r2, d2
+
+    return check
+
+
+def _cap_half_widths_deg(lat: float, dist_nm: float):
+    """Return (dlat, dlon) in degrees of the smallest lat/lon box around (lat, lon) holding every point within dist_nm."""
+    d = dist_nm / (R_M * M_TO_NM)
+    dlat = math.degrees(d)
+    s = math.sin(d) / max(math.cos(math.radians(lat)), 1e-12)
+    if d >= math.pi / 2 or s >= 1.0:
+        return dlat, 180.0  # circle reaches a pole (or half the globe): any longitude
+    return dlat, math.degrees(math.asin(s))
 
 
 def bbox_around(lat: float, lon: float, margin_deg: float = 2.0):
@@ -209,6 +338,34 @@ def _geojson_bbox_polygon(lat: float, lon: float, margin_deg: float = 1.0) -> di
     return {"type": "Polygon", "coordinates": [ring]}
 
 
+def _gfw_iso(t: datetime) -> str:
+    """Format a UTC datetime as YYYY-MM-DDTHH:MM:SS.000Z (GFW date-range); avoids strftime's format parsing."""
+    return f"{t.year:04d}-{t.month:02d}-{t.day:02d}T{t.hour:02d}:{t.minute:02d}:{t.second:02d}.000Z"
+
+
+def _gfw_post(url: str, body: bytes, headers: dict, timeout: float = 60.0):
+    """
+    POST to the GFW gateway via urllib (honours HTTPS_PROXY / system proxy settings). Returns (status, reason, body bytes).
+    Dropped/reset connections and 429/5xx replies are retried up to 3 attempts with backoff; timeouts and permanent
+    failures (DNS resolution, TLS/certificate errors) are raised at once.
+    """
+    for attempt in range(3):
+        req = urllib.request.Request(url, data=body, method="POST", headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return resp.status, resp.reason, resp.read()
+        except urllib.error.HTTPError as e:
+            if e.code not in (429, 500, 502, 503, 504) or attempt == 2:
+                return e.code, e.reason, e.read()
+        except urllib.error.URLError as e:
+            if not isinstance(e.reason, ConnectionError) or attempt == 2:
+                raise
+        except (http.client.HTTPException, ConnectionError):
+            if attempt == 2:
+                raise
+        time.sleep(2.0 * (attempt + 1))
+
+
 def fetch_gfw_recent_presence(ref_lat: float, ref_lon: float, gfw_token: str) -> dict:
     """
     Fetch vessel presence in area from Global Fishing Watch (last 96h). Non-commercial use.
@@ -217,9 +374,9 @@ def fetch_gfw_recent_presence(ref_lat: float, ref_lon: float, gfw_token: str) ->
     if not gfw_token or not gfw_token.strip():
         return {"ok": False, "count": None, "error": "no token"}
     gfw_token = gfw_token.strip()
-    end_utc = datetime.now(timezone.utc)
+    end_utc = datetime.now(timezone.utc).replace(microsecond=0)
     start_utc = end_utc - timedelta(hours=GFW_HOURS_LOOKBACK)
-    date_range = f"{start_utc.strftime('%Y-%m-%dT%H:%M:%S.000Z')},{end_utc.strftime('%Y-%m-%dT%H:%M:%S.000Z')}"
+    date_range = f"{_gfw_iso(start_utc)},{_gfw_iso(end_utc)}"
     geojson = _geojson_bbox_polygon(ref_lat, ref_lon, margin_deg=1.0)
     query = (
         f"format=JSON"
@@ -230,28 +387,22 @@ def fetch_gfw_recent_presence(ref_lat: float, ref_lon: float, gfw_token: str) ->
         f"&group-by=VESSEL_ID"
     )
     url = f"{GFW_REPORT_URL}?{query}"
-    body = json.dumps({"geojson": geojson}).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=body,
-        method="POST",
-        headers={
-            "Authorization": f"Bearer {gfw_token}",
-            "Content-Type": "application/json",
-        },
-    )
+    body = _json_dumpb({"geojson": geojson})
+    headers = {
+        "Authorization": f"Bearer {gfw_token}",
+        "Content-Type": "application/json",
+    }
     try:
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        try:
-            err_body = e.read().decode("utf-8")
-            err_json = json.loads(err_body)
-            msg = err_json.get("detail", err_json.get("error", str(e)))
-        except Exception:
-            msg = str(e)
-        return {"ok": False, "count": None, "error": msg}
-    except (urllib.error.URLError, json.JSONDecodeError, OSError) as e:
+        status, reason, raw = _gfw_post(url, body, headers, timeout=60)
+        if status >= 400:
+            try:
+                err_json = _json_loads(raw)
+                msg = err_json.get("detail", err_json.get("error", f"HTTP Error {status}: {reason}"))
+            except Exception:
+                msg = f"HTTP Error {status}: {reason}"
+            return {"ok": False, "count": None, "error": msg}
+        data = _json_loads(raw)
+    except (http.client.HTTPException, json.JSONDecodeError, OSError) as e:
         return {"ok": False, "count": None, "error": str(e)}
     # GFW report JSON: may have "entries" list or "data" / "total"
     count = 0
@@ -274,7 +425,9 @@ async def run_proximity(
     collect_seconds: float = 60.0,
     debug: bool = False,
     use_world_bbox: bool = False,
-) -> None:
+    top: int = None,
+) -> bool:
+    # Returns True if the collection window was cut short by cancellation (Ctrl+C); results so far are still printed
     # API expects list of bboxes: [[[lat1,lon1],[lat2,lon2]], ...]; each bbox is two corners
     if use_world_bbox:
         subscribe_bbox = [AIS_WORLD_BBOX]
@@ -283,16 +436,91 @@ async def run_proximity(
     else:
         bbox = bbox_around(ref_lat, ref_lon)
         subscribe_bbox = [bbox]
-    seen = {}  # MMSI -> { mmsi, name, lat, lon, dist_nm, sog, cog, time_utc }
+    # In-range vessels as parallel columns (one row per MMSI): numeric columns are NumPy arrays,
+    # display-only columns plain lists; seen_rows maps str(MMSI) -> row
+    seen_rows = {}
+    v_lats = np.empty(1024)
+    v_lons = np.empty(1024)
+    v_dist = np.empty(1024)
+    v_mmsis, v_names, v_sogs, v_cogs, v_times = [], [], [], [], []
     closest_outside = []  # list of (dist_nm, name, mmsi, lat, lon), keep up to 5
     msg_count = 0
     msg_types = set()
     first_server_error = None
-
-    async def handle_message(raw: str) -> None:
-        nonlocal msg_count, msg_types, first_server_error
+    interrupted = False
+
+    # Pending positions, distance-filtered together by flush_batch()
+    b_lats, b_lons, b_mmsis, b_names, b_sogs, b_cogs, b_times = [], [], [], [], [], [], []
+    # Distance check specialized to this reference point and radius (constants hoisted once per run)
+    check = make_distance_checker(ref_lat, ref_lon, radius_nm)
+    # Positions outside the lat/lon box around the circle of radius max(radius_nm, 5th closest
+    # outside) can be neither in range nor among closest_outside, so skip them before any trig
+    skip_dlat = skip_dlon = math.inf
+
+    def flush_batch() -> None:
+        nonlocal skip_dlat, skip_dlon, v_lats, v_lons, v_dist
+        if not b_lats:
+            return
+        lats = np.asarray(b_lats, dtype=np.float64)
+        lons = np.asarray(b_lons, dtype=np.float64)
+        inside, dist_sq = check(lats, lons)
+        # Arrival order, so the latest in-range position per MMSI wins
+        updated = {}  # row -> batch index
+        for i in np.flatnonzero(inside).tolist():
+            key = str(b_mmsis[i])
+            row = seen_rows.get(key)
+            if row is None:
+                row = seen_rows[key] = len(v_names)
+                v_mmsis.append(b_mmsis[i])
+                v_names.append(b_names[i])
+                v_sogs.append(b_sogs[i])
+                v_cogs.append(b_cogs[i])
+                v_times.append(b_times[i])
+            else:
+                v_mmsis[row] = b_mmsis[i]
+                v_names[row] = b_names[i]
+                v_sogs[row] = b_sogs[i]
+                v_cogs[row] = b_cogs[i]
+                v_times[row] = b_times[i]
+            updated[row] = i
+        if updated:
+            if len(v_names) > v_dist.size:
+                size = max(2 * v_dist.size, len(v_names))
+                v_lats = np.resize(v_lats, size)
+                v_lons = np.resize(v_lons, size)
+                v_dist = np.resize(v_dist, size)
+            rows = np.fromiter(updated.keys(), dtype=np.intp, count=len(updated))
+            src = np.fromiter(updated.values(), dtype=np.intp, count=len(updated))
+            v_lats[rows] = lats[src]
+            v_lons[rows] = lons[src]
+            v_dist[rows] = np.sqrt(dist_sq[src])  # full precision; rounded only when printed
+        # track closest positions outside radius (for "nearest was X NM" when 0 in-range)
+        outside = np.where(~inside)[0]
+        if outside.size:
+            nearest = outside[np.argsort(dist_sq[outside], kind="stable")[:5]]
+            closest_outside.extend(
+                (math.sqrt(dist_sq[i]), b_names[i], b_mmsis[i], b_lats[i], b_lons[i]) for i in nearest.tolist()
+            )
+            closest_outside.sort(key=operator.itemgetter(0))
+            del closest_outside[5:]
+            if len(closest_outside) == 5:
+                skip_dlat, skip_dlon = _cap_half_widths_deg(ref_lat, max(radius_nm, closest_outside[-1][0]))
+        for buf in (b_lats, b_lons, b_mmsis, b_names, b_sogs, b_cogs, b_times):
+            buf.clear()
+
+    # Key casing is consistent per connection: detected on the first message that has the key, then reused
+    meta_key = None  # "MetaData" or "Metadata"
+    meta_lat_key = meta_lon_key = None  # "latitude"/"longitude" or "Latitude"/"Longitude"
+
+    async def handle_message(raw: "bytes | str") -> None:
+        nonlocal msg_count, msg_types, first_server_error, meta_key, meta_lat_key, meta_lon_key
+        if not debug:  # --debug parses every frame so all message types are reported
+            pos_marker, err_marker = _SNIFF_MARKERS[type(raw)]
+            if pos_marker not in raw and err_marker not in raw:
+                msg_count += 1
+                return
         try:
-            msg = json.loads(raw)
+            msg = _json_loads(raw)
         except json.JSONDecodeError:
             return
         msg_count += 1
@@ -314,43 +542,42 @@ async def run_proximity(
             payload = payload.get(msg_type)
         else:
             payload = None
-        meta = msg.get("MetaData") or msg.get("Metadata") or {}
+        if meta_key is None:
+            meta_key = "MetaData" if "MetaData" in msg else "Metadata" if "Metadata" in msg else None
+        meta = msg.get(meta_key) or {}
         if not payload:
             return
-        lat = payload.get("Latitude")
-        lon = payload.get("Longitude")
+        # bound once; up to 8 field reads per message below
+        pget = payload.get
+        mget = meta.get
+        lat = pget("Latitude")
+        lon = pget("Longitude")
         if lat is None or lon is None:
-            lat = meta.get("latitude") or meta.get("Latitude")
-            lon = meta.get("longitude") or meta.get("Longitude")
+            if meta_lat_key is None:
+                if "latitude" in meta:
+                    meta_lat_key, meta_lon_key = "latitude", "longitude"
+                elif "Latitude" in meta:
+                    meta_lat_key, meta_lon_key = "Latitude", "Longitude"
+            lat = mget(meta_lat_key)
+            lon = mget(meta_lon_key)
         if lat is None or lon is None:
             return
-        dist = haversine_nm(ref_lat, ref_lon, lat, lon)
-        mmsi = payload.get("UserID") or meta.get("MMSI") or "?"
-        name = (meta.get("ShipName") or "").strip() or "(no name)"
-        sog = payload.get("Sog")
-        cog = payload.get("Cog")
-        time_utc = meta.get("time_utc") or ""
-        if dist > radius_nm:
-            # track closest positions outside radius (for "nearest was X NM" when 0 in-range)
-            entry = (dist, name, mmsi, lat, lon)
-            if len(closest_outside) < 5:
-                closest_outside.append(entry)
-                closest_outside.sort(key=lambda x: x[0])
-            elif dist < closest_outside[-1][0]:
-                closest_outside.append(entry)
-                closest_outside.sort(key=lambda x: x[0])
-                closest_outside.pop()
+        if abs(lat - ref_lat) > skip_dlat or abs((lon - ref_lon + 180.0) % 360.0 - 180.0) > skip_dlon:
             return
-        seen[str(mmsi)] = {
-            "mmsi": mmsi,
-            "name": name,
-            "lat": lat,
-            "lon": lon,
-            "dist_nm": round(dist, 2),
-            "sog": sog,
-            "cog": cog,
-            "time_utc": time_utc,
-        }
+        mmsi = pget("UserID") or mget("MMSI") or "?"
+        name = (mget("ShipName") or "").strip() or "(no name)"
+        sog = pget("Sog")
+        cog = pget("Cog")
+        time_utc = mget("time_utc") or ""
+        b_lats.append(lat)
+        b_lons.append(lon)
+        b_mmsis.append(mmsi)
+        b_names.append(name)
+        b_sogs.append(sog)
+        b_cogs.append(cog)
+        b_times.append(time_utc)
+        if len(b_lats) >= AIS_BATCH_SIZE:
+            flush_batch()
 
     subscribe = {
         "APIKey": api_key,
@@ -362,39 +589,41 @@ async def run_proximity(
         ],
     }
 
-    loop = asyncio.get_running_loop()
+    async def consume(recv) -> None:
+        # A server error (e.g. invalid API key) ends the subscription; stop listening early
+        while first_server_error is None:
+            await handle_message(await recv())
+
     open_timeout = 45.0  # handshake can be slow; default 10s often too short
     last_err = None
     for attempt in range(3):
         try:
-            async with websockets.connect(
+            async with _ws_connect(
                 AIS_STREAM_URL,
                 open_timeout=open_timeout,
                 close_timeout=10.0,
+                compression=None,  # AIS frames are small JSON; skip per-frame deflate
             ) as ws:
-                await ws.send(json.dumps(subscribe))
+                recv = functools.partial(ws.recv, **_RECV_KWARGS)
+                await ws.send(_json_dumpb(subscribe).decode("utf-8"))
                 # Wait for first message (error or data) so we know subscription was accepted
                 try:
-                    first_raw = await asyncio.wait_for(ws.recv(), timeout=8.0)
+                    first_raw = await asyncio.wait_for(recv(), timeout=8.0)
                     await handle_message(first_raw)
                 except asyncio.TimeoutError:
                     print(
                         "AIS Stream: no message in 8s after subscribe. Try --world to test global stream, or check API key at https://aisstream.io/apikeys",
                         file=sys.stderr,
                     )
-                end = loop.time() + collect_seconds
+                # One timeout for the whole collection window rather than one per frame
                 try:
-                    while loop.time() < end:
-                        try:
-                            raw = await asyncio.wait_for(ws.recv(), timeout=10.0)
-                            await handle_message(raw)
-                        except asyncio.TimeoutError:
-                            continue
-                        except (ConnectionError, websockets.exceptions.ConnectionClosed) as e:
-                            print(f"AIS Stream connection closed: {e}", file=sys.stderr)
-                            break
-                except asyncio.CancelledError:
+                    await asyncio.wait_for(consume(recv), timeout=collect_seconds)
+                except asyncio.TimeoutError:
                     pass
+                except (ConnectionError, websockets.exceptions.ConnectionClosed) as e:
+                    print(f"AIS Stream connection closed: {e}", file=sys.stderr)
+                except asyncio.CancelledError:
+                    interrupted = True
             break
         except (asyncio.TimeoutError, OSError) as e:
             last_err = e
@@ -406,43 +635,56 @@ async def run_proximity(
                     file=sys.stderr,
                 )
                 raise
+    flush_batch()
 
+    n_seen = len(v_names)
     if debug:
         print(
-            f"[debug] AIS Stream: received {msg_count} messages, types={sorted(msg_types)!r}, in-range={len(seen)}",
+            f"[debug] AIS Stream: received {msg_count} messages, types={sorted(msg_types)!r}, in-range={n_seen}",
             file=sys.stderr,
         )
         if first_server_error:
             print(f"[debug] first server error: {first_server_error!r}", file=sys.stderr)
 
-    # Output: name, distance, heading (course), speed, position
-    print(f"Reference position: {ref_lat:.5f}, {ref_lon:.5f}")
-    print(f"Vessels within {radius_nm} NM (collected over ~{int(collect_seconds)}s): {len(seen)}")
-    print("-" * 60)
-    if seen:
-        print("  Name | Distance (NM) | Heading (°) | Speed (kt) | Position")
-        for v in sorted(seen.values(), key=lambda x: x["dist_nm"]):
-            name = (v["name"] or "(no name)").strip() or "(no name)"
-            heading = f"{v['cog']:.0f}°" if v.get("cog") is not None else "—"
-            sog = f"{v['sog']} kt" if v.get("sog") is not None else "—"
-            pos = f"{v['lat']:.5f}, {v['lon']:.5f}"
-            print(f"  {name}")
-            print(f"      {v['dist_nm']:.1f} NM  |  Heading {heading}  |  Speed {sog}  |  {pos}")
-            print(f"      MMSI {v['mmsi']}  {v.get('time_utc', '')}")
+    # Output: name, distance, heading (course), speed, position; built up and written in one call
+    out = [
+        f"Reference position: {ref_lat:.5f}, {ref_lon:.5f}",
+        f"Vessels within {radius_nm} NM (collected over ~{int(collect_seconds)}s): {n_seen}",
+        "-" * 60,
+    ]
+    if n_seen:
+        # stable, so equal distances keep first-seen order
+        order = np.argsort(v_dist[:n_seen], kind="stable")
+        if top is not None and top < n_seen:
+            out.append(f"  (closest {top} shown)")
+            order = order[:top]
+        out.append("  Name | Distance (NM) | Heading (°) | Speed (kt) | Position")
+        for row in order.tolist():
+            name = (v_names[row] or "(no name)").strip() or "(no name)"
+            heading = f"{v_cogs[row]:.0f}°" if v_cogs[row] is not None else "—"
+            sog = f"{v_sogs[row]} kt" if v_sogs[row] is not None else "—"
+            out.append(
+                f"  {name}\n"
+                f"      {v_dist[row]:.1f} NM  |  Heading {heading}  |  Speed {sog}  |  {v_lats[row]:.5f}, {v_lons[row]:.5f}\n"
+                f"      MMSI {v_mmsis[row]}  {v_times[row]}"
+            )
     else:
-        print("  No vessels in range this time.")
+        out.append("  No vessels in range this time.")
         if msg_count > 0:
-            print("  Live AIS had no vessels within radius during this run; GFW (below) shows recent presence in the area.")
+            out.append("  Live AIS had no vessels within radius during this run; GFW (below) shows recent presence in the area.")
             if closest_outside:
-                print("  Closest AIS positions this run (outside radius):")
+                out.append("  Closest AIS positions this run (outside radius):")
                 for dist_nm, name, mmsi, lat, lon in closest_outside[:3]:
-                    print(f"    {dist_nm:.0f} NM — {name}  MMSI {mmsi}  ({lat:.4f}, {lon:.4f})")
-        print("  You can try a larger radius (e.g. --radius 50) or run again later.")
+                    out.append(f"    {dist_nm:.0f} NM — {name}  MMSI {mmsi}  ({lat:.4f}, {lon:.4f})")
+        out.append("  You can try a larger radius (e.g. --radius 50) or run again later.")
+    sys.stdout.write("\n".join(out) + "\n")
+    return interrupted
 
 
-def print_gfw_summary(ref_lat: float, ref_lon: float, gfw_token: str) -> None:
-    """Fetch and print GFW vessel presence (last 96h) in area; optional second data source."""
-    result = fetch_gfw_recent_presence(ref_lat, ref_lon, gfw_token)
+def print_gfw_summary(ref_lat: float, ref_lon: float, gfw_token: str, result: dict = None) -> None:
+    """Print GFW vessel presence (last 96h) in area; optional second data source. Fetches unless result is given."""
+    if result is None:
+        result = fetch_gfw_recent_presence(ref_lat, ref_lon, gfw_token)
     print("-" * 60)
     if not gfw_token or not gfw_token.strip():
         print("GFW (last 96h): skipped (no token). Get free token: https://globalfishingwatch.org/our-apis/tokens")
@@ -457,6 +699,70 @@ def print_gfw_summary(ref_lat: float, ref_lon: float, gfw_token: str) -> None:
         print("GFW (last 96h): vessel presence in area: No vessels in last 96 hours")
 
 
+def _start_gfw_fetch(ref_lat: float, ref_lon: float, gfw_token: str) -> asyncio.Future:
+    """
+    Run fetch_gfw_recent_presence on a daemon thread and return a future for its result.
+    The thread is never joined (unlike asyncio.to_thread), so cancelling the future lets the process exit at once.
+    """
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+
+    def deliver(result, exc) -> None:
+        if fut.done():  # cancelled: nobody is waiting for GFW any more
+            return
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+
+    def work() -> None:
+        result, exc = None, None
+        try:
+            result = fetch_gfw_recent_presence(ref_lat, ref_lon, gfw_token)
+        except Exception as e:
+            exc = e
+        try:
+            loop.call_soon_threadsafe(deliver, result, exc)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    threading.Thread(target=work, name="gfw-fetch", daemon=True).start()
+    return fut
+
+
+async def run_with_gfw(ref_lat: float, ref_lon: float, gfw_token: str, **proximity_kwargs) -> dict:
+    """
+    Run run_proximity with the GFW request in flight on a daemon thread; return the GFW result (None without token).
+    If AIS fails or collection is interrupted (Ctrl+C), the GFW request is abandoned rather than awaited.
+    """
+    gfw_fut = None
+    if gfw_token and gfw_token.strip():
+        gfw_fut = _start_gfw_fetch(ref_lat, ref_lon, gfw_token)
+    try:
+        interrupted = await run_proximity(ref_lat=ref_lat, ref_lon=ref_lon, **proximity_kwargs)
+    except BaseException:
+        if gfw_fut is not None:
+            gfw_fut.cancel()
+        raise
+    if gfw_fut is None:
+        return None
+    if interrupted and not gfw_fut.done():
+        gfw_fut.cancel()
+        return {"ok": False, "count": None, "error": "interrupted before the request finished"}
+    return await gfw_fut
+
+
+def _positive_int(raw: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        n = int(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {raw!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(
         description="List AIS vessels within radius (NM) of a reference position (friend's boat)."
@@ -485,6 +791,13 @@ def main() -> None:
         default=60.0,
         help="Seconds to collect AIS messages (default 60)",
     )
+    ap.add_argument(
+        "--top",
+        type=_positive_int,
+        default=None,
+        metavar="N",
+        help="Only list the N closest live AIS vessels (default: all in radius)",
+    )
     ap.add_argument(
         "--api-key",
         default=os.environ.get("AISSTREAM_API_KEY", DEFAULT_AISSTREAM_API_KEY).strip(),
@@ -542,19 +855,21 @@ def main() -> None:
         )
         sys.exit(1)
 
-    asyncio.run(
-        run_proximity(
+    # Second source (GFW vessel presence in area, last 96h) is fetched while live AIS is collected
+    gfw_result = asyncio.run(
+        run_with_gfw(
             ref_lat=ref_lat,
             ref_lon=ref_lon,
+            gfw_token=args.gfw_token,
             radius_nm=args.radius,
             api_key=args.api_key,
             collect_seconds=args.collect,
             debug=args.debug,
             use_world_bbox=args.world,
+            top=args.top,
         )
     )
-    # Second source: GFW vessel presence in area (last 96h)
-    print_gfw_summary(ref_lat, ref_lon, args.gfw_token)
+    print_gfw_summary(ref_lat, ref_lon, args.gfw_token, result=gfw_result)
 
 
 if __name__ == "__main__":